@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import time
 import uuid
-
-from fastapi import FastAPI, HTTPException
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from functools import partial
+
+import anyio
+import orjson
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from .config import app_config
 from .engine import WorkflowEngine
@@ -13,7 +23,19 @@ from .nodes.base import NodeRegistry
 from .store import SQLiteStore
 from .tooling import tool_catalog
 
-app = FastAPI(title="OpenFlow", version="0.2.0")
+
+class _FastJSONResponse(ORJSONResponse):
+    """orjson rendering, falling back to stdlib json for values orjson rejects."""
+
+    def render(self, content: object) -> bytes:
+        try:
+            return super().render(content)
+        except TypeError:
+            # e.g. integers beyond 64 bits, which stdlib json serializes fine.
+            return JSONResponse.render(self, content)
+
+
+app = FastAPI(title="OpenFlow", version="0.2.0", default_response_class=_FastJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://127.0.0.1:5173", "http://localhost:5173"],
@@ -28,98 +50,180 @@ register_builtin_nodes(registry)
 engine = WorkflowEngine(registry)
 store = SQLiteStore()
 
+# Workflow definitions served by GET endpoints, keyed by id. Only touched from
+# async route handlers (the event loop thread), so no lock is needed.
+_WORKFLOW_CACHE_SIZE = 1024
+_WORKFLOW_CACHE_TTL = 60.0
+_workflow_cache: OrderedDict[str, tuple[float, Workflow]] = OrderedDict()
+
+
+def _cache_workflow(workflow: Workflow) -> None:
+    _workflow_cache[workflow.id] = (time.monotonic() + _WORKFLOW_CACHE_TTL, workflow)
+    _workflow_cache.move_to_end(workflow.id)
+    while len(_workflow_cache) > _WORKFLOW_CACHE_SIZE:
+        _workflow_cache.popitem(last=False)
+
+
+async def _load_workflow(workflow_id: str) -> Workflow | None:
+    entry = _workflow_cache.get(workflow_id)
+    if entry is not None:
+        expires_at, workflow = entry
+        if expires_at > time.monotonic():
+            _workflow_cache.move_to_end(workflow_id)
+            return workflow
+        del _workflow_cache[workflow_id]
+    workflow = await anyio.to_thread.run_sync(store.get_workflow, workflow_id)
+    # A concurrent create/update may have cached a newer copy while we were loading.
+    if workflow is not None and workflow_id not in _workflow_cache:
+        _cache_workflow(workflow)
+    return workflow
+
+
+# Generated workflow ids are minted in batches from one os.urandom() read.
+_ID_BATCH_SIZE = 256
+_id_pool: deque[str] = deque()
+
+
+def _new_workflow_id() -> str:
+    try:
+        return _id_pool.popleft()
+    except IndexError:
+        pass
+    raw = os.urandom(16 * _ID_BATCH_SIZE)
+    batch = [str(uuid.UUID(bytes=raw[i : i + 16], version=4)) for i in range(0, len(raw), 16)]
+    _id_pool.extend(batch[1:])
+    return batch[0]
+
+
+def _static_json(content: object) -> tuple[bytes, str]:
+    body = orjson.dumps(content)
+    return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _static_json_response(request: Request, body: bytes, etag: str) -> Response:
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+# Node types are registered once at import and config files are only read at
+# startup, so these responses never change for the life of the process.
+_NODE_TYPES_JSON = _static_json(registry.list_types())
+_NODE_CATALOG_JSON = _static_json(registry.list_specs())
+# The cached config views are read-only mappings/tuples; encode to plain JSON types.
+_CONFIG_JSON = _static_json(
+    jsonable_encoder(
+        {
+            "agent_defaults": app_config.agent_defaults(),
+            "multi_agent_defaults": app_config.multi_agent_defaults(),
+            "profile_8gb": app_config.profile_8gb(),
+            "agent_tools": app_config.agent_tool_settings(),
+        }
+    )
+)
+
 
 @app.get("/health")
-def health() -> dict[str, str]:
+async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
-@app.get("/node-types")
-def list_node_types() -> list[str]:
-    return registry.list_types()
+@app.get("/node-types", response_model=list[str])
+async def list_node_types(request: Request) -> Response:
+    return _static_json_response(request, *_NODE_TYPES_JSON)
 
 
-@app.get("/node-catalog")
-def node_catalog() -> list[dict[str, str]]:
-    return registry.list_specs()
+@app.get("/node-catalog", response_model=list[dict[str, str]])
+async def node_catalog(request: Request) -> Response:
+    return _static_json_response(request, *_NODE_CATALOG_JSON)
 
 
-@app.get("/config")
-def config() -> dict[str, dict[str, object]]:
-    return {
-        "agent_defaults": app_config.agent_defaults(),
-        "multi_agent_defaults": app_config.multi_agent_defaults(),
-        "profile_8gb": app_config.profile_8gb(),
-        "agent_tools": app_config.agent_tool_settings(),
-    }
+@app.get("/config", response_model=dict[str, dict[str, object]])
+async def config(request: Request) -> Response:
+    return _static_json_response(request, *_CONFIG_JSON)
 
 
 @app.get("/tool-catalog")
-def tools() -> list[dict[str, str]]:
+async def tools() -> list[dict[str, str]]:
     return tool_catalog()
 
 
 @app.post("/workflows", response_model=Workflow)
-def create_workflow(workflow: Workflow) -> Workflow:
-    existing = store.get_workflow(workflow.id)
+async def create_workflow(workflow: Workflow) -> Workflow:
+    existing = await _load_workflow(workflow.id)
     if existing:
         raise HTTPException(status_code=409, detail="Workflow id already exists")
-    return store.create_workflow(workflow)
+    created = await anyio.to_thread.run_sync(store.create_workflow, workflow)
+    _cache_workflow(created)
+    return created
 
 
 @app.post("/workflows/new", response_model=Workflow)
-def create_workflow_with_generated_id(workflow: Workflow) -> Workflow:
-    created = workflow.model_copy(update={"id": str(uuid.uuid4())})
-    return store.create_workflow(created)
+async def create_workflow_with_generated_id(workflow: Workflow) -> Workflow:
+    created = workflow.model_copy(update={"id": _new_workflow_id()})
+    created = await anyio.to_thread.run_sync(store.create_workflow, created)
+    _cache_workflow(created)
+    return created
 
 
 @app.get("/workflows", response_model=list[Workflow])
-def list_workflows() -> list[Workflow]:
-    return store.list_workflows()
+async def list_workflows() -> list[Workflow]:
+    return await anyio.to_thread.run_sync(store.list_workflows)
 
 
 @app.get("/workflows/{workflow_id}", response_model=Workflow)
-def get_workflow(workflow_id: str) -> Workflow:
-    workflow = store.get_workflow(workflow_id)
+async def get_workflow(workflow_id: str) -> Workflow:
+    workflow = await _load_workflow(workflow_id)
     if workflow is None:
         raise HTTPException(status_code=404, detail="Workflow not found")
     return workflow
 
 
 @app.put("/workflows/{workflow_id}", response_model=Workflow)
-def update_workflow(workflow_id: str, workflow: Workflow) -> Workflow:
+async def update_workflow(workflow_id: str, workflow: Workflow) -> Workflow:
     if workflow.id != workflow_id:
         raise HTTPException(status_code=400, detail="Workflow id mismatch")
-    updated = store.update_workflow(workflow_id, workflow)
+    updated = await anyio.to_thread.run_sync(store.update_workflow, workflow_id, workflow)
     if updated is None:
+        _workflow_cache.pop(workflow_id, None)
         raise HTTPException(status_code=404, detail="Workflow not found")
+    _cache_workflow(updated)
     return updated
 
 
 @app.post("/workflows/{workflow_id}/run", response_model=ExecutionRecord)
-def run_workflow(workflow_id: str, request: RunRequest) -> ExecutionRecord:
-    workflow = store.get_workflow(workflow_id)
+async def run_workflow(workflow_id: str, request: RunRequest) -> ExecutionRecord:
+    workflow = await _load_workflow(workflow_id)
     if workflow is None:
         raise HTTPException(status_code=404, detail="Workflow not found")
 
-    execution = store.create_execution(workflow_id)
-
+    # Runs complete within the request, so the execution row is written once, finished.
+    started_at = datetime.now(timezone.utc)
     try:
-        result = engine.run(workflow, request.input_data)
-        store.finish_execution(execution.id, status="success", result=result)
+        result = await anyio.to_thread.run_sync(engine.run, workflow, request.input_data)
+        execution = await anyio.to_thread.run_sync(
+            partial(store.record_execution, workflow_id, "success", started_at, result=result)
+        )
     except Exception as exc:
-        store.finish_execution(execution.id, status="failed", error=str(exc))
+        await anyio.to_thread.run_sync(
+            partial(store.record_execution, workflow_id, "failed", started_at, error=str(exc))
+        )
         raise HTTPException(status_code=400, detail=f"Execution failed: {exc}") from exc
 
-    updated = store.get_execution(execution.id)
-    if updated is None:
-        raise HTTPException(status_code=500, detail="Execution record missing")
-    return updated
+    return execution
 
 
 @app.get("/executions/{execution_id}", response_model=ExecutionRecord)
-def get_execution(execution_id: str) -> ExecutionRecord:
-    execution = store.get_execution(execution_id)
+async def get_execution(execution_id: str) -> ExecutionRecord:
+    execution = await anyio.to_thread.run_sync(store.get_execution, execution_id)
     if execution is None:
         raise HTTPException(status_code=404, detail="Execution not found")
     return execution
+
+
+@app.get("/executions/{execution_id}/status")
+async def get_execution_status(execution_id: str) -> dict[str, str]:
+    status = await anyio.to_thread.run_sync(store.get_execution_status, execution_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Execution not found")
+    return {"id": execution_id, "status": status}
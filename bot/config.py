@@ -2,10 +2,35 @@ from __future__ import annotations
 
 import json
 from configparser import ConfigParser
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping, Sequence
 
 import yaml
 
+try:  # libyaml C bindings when PyYAML was built with them
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# config.ini keys with a non-string type; coerced once when the file is loaded.
+_INT_KEYS = frozenset({"num_ctx", "num_predict", "max_tool_calls", "tavily_max_results"})
+_FLOAT_KEYS = frozenset({"temperature"})
+_CSV_KEYS = frozenset({"tools", "allow_http_domains"})
+_JSON_LIST_KEYS = frozenset({"agents_json"})
+
+_MISSING = object()
+
+
+def _freeze(value: Any) -> Any:
+    """Return a read-only copy so cached config cannot be mutated by callers."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
 
 class AppConfig:
     def __init__(self) -> None:
@@ -15,18 +40,19 @@ class AppConfig:
         parser.read(config_path)
         if not parser.sections():
             parser.read(Path("config.ini"))
-        self._parser = parser
+        self._cfg = self._materialize(parser)
         prompts_path = package_root / "prompts.yaml"
         self._prompts = self._load_prompts(prompts_path)
 
-    def agent_defaults(self) -> dict[str, object]:
+    @lru_cache(maxsize=1)
+    def agent_defaults(self) -> Mapping[str, object]:
         single_prompt = self._prompts.get("single_agent", {})
         prompt_text = (
             single_prompt.get("system_prompt")
             if isinstance(single_prompt, dict)
             else None
         )
-        return {
+        return _freeze({
             "model": self._get_str("agent_defaults", "model", "qwen2.5:1.5b"),
             "system_prompt": self._get_str(
                 "agent_defaults",
@@ -41,23 +67,26 @@ class AppConfig:
             "temperature": self._get_float("agent_defaults", "temperature", 0.2),
             "tools": self._get_csv("agent_defaults", "tools", ["calculator", "utc_time"]),
             "max_tool_calls": self._get_int("agent_defaults", "max_tool_calls", 6),
-        }
+        })
 
-    def profile_8gb(self) -> dict[str, object]:
-        return {
+    @lru_cache(maxsize=1)
+    def profile_8gb(self) -> Mapping[str, object]:
+        return _freeze({
             "model": self._get_str("profile_8gb", "model", "qwen2.5:1.5b"),
             "num_ctx": self._get_int("profile_8gb", "num_ctx", 1024),
             "num_predict": self._get_int("profile_8gb", "num_predict", 128),
             "temperature": self._get_float("profile_8gb", "temperature", 0.2),
-        }
+        })
 
-    def agent_tool_settings(self) -> dict[str, object]:
-        return {
+    @lru_cache(maxsize=1)
+    def agent_tool_settings(self) -> Mapping[str, object]:
+        return _freeze({
             "allow_http_domains": self._get_csv("agent_tools", "allow_http_domains", []),
             "tavily_max_results": self._get_int("agent_tools", "tavily_max_results", 5),
-        }
+        })
 
-    def multi_agent_defaults(self) -> dict[str, object]:
+    @lru_cache(maxsize=1)
+    def multi_agent_defaults(self) -> Mapping[str, object]:
         fallback_agents: list[dict[str, object]] = [
             {
                 "name": "researcher",
@@ -90,7 +119,7 @@ class AppConfig:
                         )
         if yaml_agents:
             fallback_agents = yaml_agents
-        return {
+        return _freeze({
             "model": self._get_str("multi_agent_defaults", "model", "qwen2.5:1.5b"),
             "input_field": self._get_str("multi_agent_defaults", "input_field", "message"),
             "num_ctx": self._get_int("multi_agent_defaults", "num_ctx", 1024),
@@ -98,40 +127,64 @@ class AppConfig:
             "temperature": self._get_float("multi_agent_defaults", "temperature", 0.2),
             "max_tool_calls": self._get_int("multi_agent_defaults", "max_tool_calls", 4),
             "agents": self._get_json_list("multi_agent_defaults", "agents_json", fallback_agents),
-        }
+        })
 
     def _get_str(self, section: str, key: str, fallback: str) -> str:
-        return self._parser.get(section, key, fallback=fallback)
+        return self._cfg.get(section, {}).get(key, fallback)
 
     def _get_int(self, section: str, key: str, fallback: int) -> int:
-        return self._parser.getint(section, key, fallback=fallback)
+        return self._cfg.get(section, {}).get(key, fallback)
 
     def _get_float(self, section: str, key: str, fallback: float) -> float:
-        return self._parser.getfloat(section, key, fallback=fallback)
-
-    def _get_csv(self, section: str, key: str, fallback: list[str]) -> list[str]:
-        value = self._parser.get(section, key, fallback="")
-        if not value:
-            return list(fallback)
-        return [part.strip() for part in value.split(",") if part.strip()]
-
-    def _get_json_list(self, section: str, key: str, fallback: list[dict[str, object]]) -> list[dict[str, object]]:
-        value = self._parser.get(section, key, fallback="")
-        if not value:
-            return list(fallback)
-        try:
-            parsed = json.loads(value)
-            if isinstance(parsed, list):
-                return [item for item in parsed if isinstance(item, dict)]
-        except json.JSONDecodeError:
-            pass
-        return list(fallback)
+        return self._cfg.get(section, {}).get(key, fallback)
+
+    def _get_csv(self, section: str, key: str, fallback: Sequence[str]) -> Sequence[str]:
+        return self._cfg.get(section, {}).get(key, fallback)
+
+    def _get_json_list(
+        self, section: str, key: str, fallback: Sequence[dict[str, object]]
+    ) -> Sequence[dict[str, object]]:
+        return self._cfg.get(section, {}).get(key, fallback)
+
+    @staticmethod
+    def _materialize(parser: ConfigParser) -> dict[str, dict[str, Any]]:
+        cfg: dict[str, dict[str, Any]] = {}
+        for section in parser.sections():
+            values: dict[str, Any] = {}
+            for key, raw in parser.items(section):
+                value = AppConfig._coerce(key, raw)
+                if value is not _MISSING:
+                    values[key] = value
+            cfg[section] = values
+        return cfg
+
+    @staticmethod
+    def _coerce(key: str, raw: str) -> Any:
+        if key in _INT_KEYS:
+            return int(raw)
+        if key in _FLOAT_KEYS:
+            return float(raw)
+        if key in _CSV_KEYS:
+            if not raw:
+                return _MISSING
+            return tuple(part.strip() for part in raw.split(",") if part.strip())
+        if key in _JSON_LIST_KEYS:
+            if not raw:
+                return _MISSING
+            try:
+                parsed = json.loads(raw)
+            except json.JSONDecodeError:
+                return _MISSING
+            if not isinstance(parsed, list):
+                return _MISSING
+            return tuple(item for item in parsed if isinstance(item, dict))
+        return raw
 
     def _load_prompts(self, path: Path) -> dict[str, object]:
         if not path.exists():
             return {}
         try:
-            raw = yaml.safe_load(path.read_text(encoding="utf-8"))
+            raw = yaml.load(path.read_text(encoding="utf-8"), Loader=_YamlLoader)  # noqa: S506
         except Exception:
             return {}
         return raw if isinstance(raw, dict) else {}
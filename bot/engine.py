@@ -1,79 +1,144 @@
 from __future__ import annotations
 
-from collections import defaultdict, deque
-from typing import Any
+from collections import ChainMap, defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Mapping, Sequence
 
 from .models import Node, Workflow
 from .nodes.base import NodeRegistry
 
 
+# Upper bound on sibling nodes executed concurrently within one workflow run.
+MAX_PARALLEL_NODES = 8
+
+
 class WorkflowEngine:
-    def __init__(self, registry: NodeRegistry) -> None:
+    def __init__(self, registry: NodeRegistry, max_workers: int = MAX_PARALLEL_NODES) -> None:
         self.registry = registry
+        self.max_workers = max_workers
 
     def run(self, workflow: Workflow, input_data: dict[str, Any]) -> dict[str, Any]:
-        ordered_nodes = self._topological_sort(workflow.nodes, workflow.edges)
-        results: dict[str, dict[str, Any]] = {}
-
-        for node in ordered_nodes:
-            parent_payload = self._merge_parent_payloads(node, workflow.edges, results)
-            if not parent_payload:
-                parent_payload = input_data
-
-            handler = self.registry.get(node.type).handler
-            results[node.id] = handler(node.params, parent_payload)
+        if self._is_linear(workflow.nodes, workflow.edges):
+            return self._run_linear(workflow.nodes, input_data, chained=bool(workflow.edges))
 
+        ordered_nodes = self._topological_sort(workflow.nodes, workflow.edges)
         if not ordered_nodes:
             return input_data
 
+        incoming: dict[str, list[str]] = defaultdict(list)
+        for source, targets in workflow.edges.items():
+            for target in targets:
+                incoming[target].append(source)
+        remaining = {node.id: len(incoming[node.id]) for node in ordered_nodes}
+        node_map = {node.id: node for node in ordered_nodes}
+        # Only the scheduling thread below reads or writes results; workers just run handlers.
+        results: dict[str, dict[str, Any]] = {}
+        pending: dict[Future[dict[str, Any]], str] = {}
+
+        with ThreadPoolExecutor(max_workers=min(len(ordered_nodes), self.max_workers)) as executor:
+
+            def submit(node: Node) -> None:
+                spec = self.registry.get(node.type)
+                parent_payload = self._merge_parent_payloads(
+                    incoming[node.id], results, readonly=spec.readonly_payload
+                )
+                if not parent_payload:
+                    parent_payload = input_data
+                pending[executor.submit(spec.handler, node.params, parent_payload)] = node.id
+
+            try:
+                for node in ordered_nodes:
+                    if remaining[node.id] == 0:
+                        submit(node)
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        node_id = pending.pop(future)
+                        results[node_id] = future.result()
+                        for target in workflow.edges.get(node_id, []):
+                            remaining[target] -= 1
+                            if remaining[target] == 0:
+                                submit(node_map[target])
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
         return results[ordered_nodes[-1].id]
 
+    def _is_linear(self, nodes: Sequence[Node], edges: dict[str, list[str]]) -> bool:
+        """True when nodes have no edges, or edges form a chain in declaration order."""
+        if len({node.id for node in nodes}) != len(nodes):
+            return False
+        if not edges:
+            return True
+        if len(edges) != len(nodes) - 1:
+            return False
+        return all(edges.get(current.id) == [following.id] for current, following in zip(nodes, nodes[1:]))
+
+    def _run_linear(self, nodes: Sequence[Node], input_data: dict[str, Any], *, chained: bool) -> dict[str, Any]:
+        # Same semantics as the scheduler: a node without parents (every node when
+        # unchained) or whose parent produced an empty payload receives input_data.
+        result = input_data
+        for node in nodes:
+            parent_payload = result if chained else input_data
+            if not parent_payload:
+                parent_payload = input_data
+            result = self.registry.get(node.type).handler(node.params, parent_payload)
+        return result
+
     def _merge_parent_payloads(
         self,
-        node: Node,
-        edges: dict[str, list[str]],
+        incoming_sources: list[str],
         results: dict[str, dict[str, Any]],
-    ) -> dict[str, Any]:
-        incoming: list[str] = []
-        for source, targets in edges.items():
-            if node.id in targets:
-                incoming.append(source)
-
-        if not incoming:
+        *,
+        readonly: bool = False,
+    ) -> Mapping[str, Any]:
+        if not incoming_sources:
             return {}
+        if len(incoming_sources) == 1:
+            return results.get(incoming_sources[0], {})
+        if readonly:
+            # Later parents win, matching the dict.update() order below.
+            return ChainMap(*(results.get(source, {}) for source in reversed(incoming_sources)))
+        if len(incoming_sources) == 2:
+            return {**results.get(incoming_sources[0], {}), **results.get(incoming_sources[1], {})}
 
         merged: dict[str, Any] = {}
-        for source in incoming:
+        for source in incoming_sources:
             merged.update(results.get(source, {}))
         return merged
 
-    def _topological_sort(self, nodes: list[Node], edges: dict[str, list[str]]) -> list[Node]:
-        node_map = {n.id: n for n in nodes}
-        indegree = defaultdict(int)
-
-        for node in nodes:
-            indegree[node.id] = 0
+    def _topological_sort(self, nodes: Sequence[Node], edges: dict[str, list[str]]) -> list[Node]:
+        idx = {node.id: i for i, node in enumerate(nodes)}
+        if len(idx) != len(nodes):
+            raise ValueError("Workflow has duplicate node ids")
 
+        indegree = [0] * len(nodes)
+        adj: list[list[int]] = [[] for _ in nodes]
         for source, targets in edges.items():
-            if source not in node_map:
+            source_idx = idx.get(source)
+            if source_idx is None:
                 raise ValueError(f"Unknown source node in edges: {source}")
             for target in targets:
-                if target not in node_map:
+                target_idx = idx.get(target)
+                if target_idx is None:
                     raise ValueError(f"Unknown target node in edges: {target}")
-                indegree[target] += 1
+                adj[source_idx].append(target_idx)
+                indegree[target_idx] += 1
 
-        queue = deque([node_id for node_id, deg in indegree.items() if deg == 0])
-        order: list[Node] = []
+        queue = deque([i for i, deg in enumerate(indegree) if deg == 0])
+        order: list[int] = []
 
         while queue:
-            node_id = queue.popleft()
-            order.append(node_map[node_id])
-            for target in edges.get(node_id, []):
-                indegree[target] -= 1
-                if indegree[target] == 0:
-                    queue.append(target)
+            current = queue.popleft()
+            order.append(current)
+            for target_idx in adj[current]:
+                indegree[target_idx] -= 1
+                if indegree[target_idx] == 0:
+                    queue.append(target_idx)
 
         if len(order) != len(nodes):
             raise ValueError("Workflow graph has a cycle")
 
-        return order
+        return [nodes[i] for i in order]
@@ -3,29 +3,48 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
+
+# Shared by every API model: unknown keys are dropped rather than validated or
+# stored, and assignment is not re-validated since models are built once per request.
+_MODEL_CONFIG = ConfigDict(
+    extra="ignore",
+    arbitrary_types_allowed=False,
+    validate_assignment=False,
+    defer_build=False,
+)
 
 
 class Node(BaseModel):
+    # Nodes are never modified after parsing.
+    model_config = ConfigDict(**_MODEL_CONFIG, frozen=True)
+
     id: str
     type: str
     params: dict[str, Any] = Field(default_factory=dict)
 
 
 class Workflow(BaseModel):
+    model_config = _MODEL_CONFIG
+
     id: str
     name: str
-    nodes: list[Node]
+    nodes: tuple[Node, ...]
     edges: dict[str, list[str]] = Field(default_factory=dict)
     active: bool = False
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 class RunRequest(BaseModel):
+    model_config = _MODEL_CONFIG
+
     input_data: dict[str, Any] = Field(default_factory=dict)
 
 
-class ExecutionRecord(BaseModel):
+# A plain record with no model behaviour needed; a slotted dataclass drops the per-instance __dict__.
+@dataclass(slots=True, config=_MODEL_CONFIG)
+class ExecutionRecord:
     id: str
     workflow_id: str
     status: str
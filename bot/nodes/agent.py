@@ -1,10 +1,21 @@
 from __future__ import annotations
 
-from typing import Any
+from functools import lru_cache
+from typing import Any, Mapping
 
 from ..config import app_config
 from ..tooling import build_agent_tools
 
+try:
+    from langchain_ollama import ChatOllama
+    from langgraph.prebuilt import create_react_agent
+
+    _AGENT_IMPORT_ERROR: ImportError | None = None
+except ImportError as exc:  # Agent nodes are optional; report on first use instead.
+    ChatOllama = None
+    create_react_agent = None
+    _AGENT_IMPORT_ERROR = exc
+
 
 def _extract_text_from_agent_result(result: dict[str, Any]) -> str:
     messages = result.get("messages")
@@ -26,6 +37,25 @@ def _extract_text_from_agent_result(result: dict[str, Any]) -> str:
     return str(last)
 
 
+@lru_cache(maxsize=32)
+def _get_agent(
+    model: str,
+    num_ctx: int,
+    num_predict: int,
+    temperature: float,
+    tools_key: tuple[str, ...],
+    prompt: str,
+) -> Any:
+    """Build (once per distinct configuration) the compiled ReAct agent graph."""
+    llm = ChatOllama(
+        model=model,
+        num_ctx=num_ctx,
+        num_predict=num_predict,
+        temperature=temperature,
+    )
+    return create_react_agent(model=llm, tools=build_agent_tools(list(tools_key)), prompt=prompt)
+
+
 def _run_single_agent(
     *,
     model: str,
@@ -37,7 +67,9 @@ def _run_single_agent(
     temperature: float,
     max_tool_calls: int,
 ) -> str:
-    selected_tools = build_agent_tools(tools)
+    if _AGENT_IMPORT_ERROR is not None:
+        raise ImportError(str(_AGENT_IMPORT_ERROR)) from _AGENT_IMPORT_ERROR
+
     effective_prompt = system_prompt
     if "tavily_search" in tools:
         effective_prompt = (
@@ -46,16 +78,7 @@ def _run_single_agent(
             "use available tools before answering. If a tool fails, say that clearly."
         )
 
-    from langchain_ollama import ChatOllama
-    from langgraph.prebuilt import create_react_agent
-
-    llm = ChatOllama(
-        model=model,
-        num_ctx=num_ctx,
-        num_predict=num_predict,
-        temperature=float(temperature),
-    )
-    agent = create_react_agent(model=llm, tools=selected_tools, prompt=effective_prompt)
+    agent = _get_agent(model, num_ctx, num_predict, float(temperature), tuple(tools), effective_prompt)
 
     result = agent.invoke(
         {"messages": [{"role": "user", "content": user_prompt}]},
@@ -96,12 +119,12 @@ def _normalize_agent_chain(
 ) -> list[dict[str, Any]]:
     if raw_agents is None:
         return []
-    if not isinstance(raw_agents, list) or not raw_agents:
+    if not isinstance(raw_agents, (list, tuple)) or not raw_agents:
         raise ValueError("langgraph_agent.agents must be a non-empty list")
 
     normalized: list[dict[str, Any]] = []
     for idx, item in enumerate(raw_agents):
-        if not isinstance(item, dict):
+        if not isinstance(item, Mapping):
             raise ValueError("langgraph_agent.agents entries must be objects")
         name = item.get("name")
         system_prompt = item.get("system_prompt")
@@ -114,7 +137,7 @@ def _normalize_agent_chain(
             system_prompt = default_prompt
         if not isinstance(system_prompt, str):
             raise ValueError("Each langgraph_agent.agents[].system_prompt must be a string")
-        if not isinstance(tools, list) or any(not isinstance(t, str) for t in tools):
+        if not isinstance(tools, (list, tuple)) or any(not isinstance(t, str) for t in tools):
             raise ValueError("Each langgraph_agent.agents[].tools must be a list of strings")
 
         normalized.append(
@@ -138,14 +161,16 @@ def langgraph_agent_handler(params: dict[str, Any], payload: dict[str, Any]) ->
     num_ctx = params.get("num_ctx", defaults["num_ctx"])
     num_predict = params.get("num_predict", defaults["num_predict"])
     temperature = params.get("temperature", defaults["temperature"])
-    tools = params.get("tools", defaults.get("tools", []))
-    max_tool_calls = params.get("max_tool_calls", defaults.get("max_tool_calls", 6))
+    tools = params.get("tools", defaults["tools"])
+    max_tool_calls = params.get("max_tool_calls", defaults["max_tool_calls"])
     agents = params.get("agents")
 
     if not isinstance(system_prompt, str):
         raise ValueError("langgraph_agent.system_prompt must be a string")
-    if not isinstance(tools, list) or any(not isinstance(item, str) for item in tools):
+    if not isinstance(tools, (list, tuple)) or any(not isinstance(item, str) for item in tools):
         raise ValueError("langgraph_agent.tools must be a list of tool names")
+    # Config defaults are read-only tuples; work on a private list from here on.
+    tools = list(tools)
     model, input_field, num_ctx, num_predict, temperature, max_tool_calls = _validate_common_settings(
         model, input_field, num_ctx, num_predict, temperature, max_tool_calls
     )
@@ -4,6 +4,10 @@ from dataclasses import dataclass
 from typing import Any, Callable
 
 
+# A handler receives (params, payload) and returns the payload for downstream nodes.
+# Payloads are shared, not copied, between nodes: handlers must treat the incoming
+# payload as read-only and build a new dict when they change anything. Returning the
+# incoming payload unchanged (as manual_trigger does) is fine and avoids a copy.
 NodeHandler = Callable[[dict[str, Any], dict[str, Any]], dict[str, Any]]
 
 
@@ -12,25 +16,37 @@ class NodeSpec:
     type_name: str
     description: str
     handler: NodeHandler
+    # Set when the handler only reads its payload via the Mapping interface and never
+    # returns or embeds it; the engine may then pass a ChainMap view for multi-parent nodes.
+    readonly_payload: bool = False
 
 
 class NodeRegistry:
     def __init__(self) -> None:
         self._nodes: dict[str, NodeSpec] = {}
+        # Sorted views are built lazily and reset whenever a node type is registered.
+        self._sorted_types: tuple[str, ...] | None = None
+        self._cached_specs: tuple[dict[str, str], ...] | None = None
 
     def register(self, spec: NodeSpec) -> None:
         self._nodes[spec.type_name] = spec
+        self._sorted_types = None
+        self._cached_specs = None
 
     def get(self, type_name: str) -> NodeSpec:
         if type_name not in self._nodes:
             raise KeyError(f"Unknown node type: {type_name}")
         return self._nodes[type_name]
 
-    def list_types(self) -> list[str]:
-        return sorted(self._nodes)
-
-    def list_specs(self) -> list[dict[str, str]]:
-        return [
-            {"type": self._nodes[key].type_name, "description": self._nodes[key].description}
-            for key in sorted(self._nodes)
-        ]
+    def list_types(self) -> tuple[str, ...]:
+        if self._sorted_types is None:
+            self._sorted_types = tuple(sorted(self._nodes))
+        return self._sorted_types
+
+    def list_specs(self) -> tuple[dict[str, str], ...]:
+        if self._cached_specs is None:
+            self._cached_specs = tuple(
+                {"type": self._nodes[key].type_name, "description": self._nodes[key].description}
+                for key in self.list_types()
+            )
+        return self._cached_specs
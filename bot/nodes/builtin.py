@@ -1,11 +1,30 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+import re
+from typing import Any, Callable
+
+import orjson
 
 from .agent import langgraph_agent_handler, multi_agent_handler
 from .base import NodeRegistry, NodeSpec
 
+_PLACEHOLDER_RE = re.compile(r"\{\{([A-Za-z_]+)\}\}")
+
+def _render_json(payload: dict[str, Any]) -> str:
+    try:
+        return orjson.dumps(payload).decode()
+    except TypeError:
+        # orjson rejects integers beyond 64 bits and non-string keys.
+        return json.dumps(payload, ensure_ascii=True)
+
+
+# Known template placeholders. Each is rendered at most once per call and only
+# when it appears; any other {{name}} is left in the text unchanged.
+_PLACEHOLDERS: dict[str, Callable[[dict[str, Any]], str]] = {
+    "json": _render_json,
+}
+
 
 def manual_trigger_handler(_params: dict[str, Any], payload: dict[str, Any]) -> dict[str, Any]:
     return payload
@@ -16,9 +35,9 @@ def set_fields_handler(params: dict[str, Any], payload: dict[str, Any]) -> dict[
     if not isinstance(fields, dict):
         raise ValueError("set_fields.fields must be a dictionary")
 
-    merged = dict(payload)
-    merged.update(fields)
-    return merged
+    if not fields:
+        return payload
+    return {**payload, **fields}
 
 
 def template_handler(params: dict[str, Any], payload: dict[str, Any]) -> dict[str, Any]:
@@ -26,8 +45,22 @@ def template_handler(params: dict[str, Any], payload: dict[str, Any]) -> dict[st
     if not isinstance(template, str):
         raise ValueError("template.template must be a string")
 
-    # Safe substitution: only use literal replace on known placeholders.
-    text = template.replace("{{json}}", json.dumps(payload, ensure_ascii=True))
+    if "{{" not in template:
+        return {"text": template, "payload": payload}
+
+    # Safe substitution: a single regex pass that only expands known placeholders.
+    rendered: dict[str, str] = {}
+
+    def _resolve(match: re.Match[str]) -> str:
+        name = match.group(1)
+        render = _PLACEHOLDERS.get(name)
+        if render is None:
+            return match.group(0)
+        if name not in rendered:
+            rendered[name] = render(payload)
+        return rendered[name]
+
+    text = _PLACEHOLDER_RE.sub(_resolve, template)
     return {"text": text, "payload": payload}
 
 
@@ -58,6 +91,7 @@ def register_builtin_nodes(registry: NodeRegistry) -> None:
             type_name="langgraph_agent",
             description="Runs one or more local Ollama-backed LangGraph agents in sequence.",
             handler=langgraph_agent_handler,
+            readonly_payload=True,
         )
     )
     registry.register(
@@ -65,5 +99,6 @@ def register_builtin_nodes(registry: NodeRegistry) -> None:
             type_name="multi_agent",
             description="Legacy alias for sequential multi-agent execution.",
             handler=multi_agent_handler,
+            readonly_payload=True,
         )
     )
@@ -1,123 +1,406 @@
 from __future__ import annotations
 
 import json
+import os
+import queue
+import re
+import secrets
 import sqlite3
-import uuid
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterable, Iterator
+
+import orjson
+import pydantic_core
+from pydantic import TypeAdapter
 
 from .models import ExecutionRecord, Workflow
 
 
+# SQL used by SQLiteStore. Kept as module constants so every call passes the
+# same string and hits sqlite3's per-connection prepared-statement cache.
+_SQL_CREATE_WORKFLOWS = """
+CREATE TABLE IF NOT EXISTS workflows (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    definition BLOB NOT NULL,
+    created_at INTEGER NOT NULL
+)
+"""
+_SQL_CREATE_EXECUTIONS = """
+CREATE TABLE IF NOT EXISTS executions (
+    id TEXT PRIMARY KEY,
+    workflow_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at INTEGER NOT NULL,
+    finished_at INTEGER,
+    result BLOB,
+    error TEXT,
+    FOREIGN KEY(workflow_id) REFERENCES workflows(id)
+)
+"""
+_SQL_CREATE_EXECUTIONS_WORKFLOW_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_exec_workflow ON executions(workflow_id)"
+)
+_SQL_CREATE_WORKFLOWS_CREATED_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_wf_created ON workflows(created_at DESC)"
+)
+_SQL_INSERT_WORKFLOW = "INSERT INTO workflows (id, name, definition, created_at) VALUES (?, ?, ?, ?)"
+_SQL_UPDATE_WORKFLOW = "UPDATE workflows SET name = ?, definition = ? WHERE id = ?"
+_SQL_GET_WORKFLOW = "SELECT definition FROM workflows WHERE id = ?"
+_SQL_LIST_WORKFLOWS = "SELECT definition FROM workflows ORDER BY created_at DESC"
+_SQL_INSERT_EXECUTION = (
+    "INSERT INTO executions (id, workflow_id, status, started_at, finished_at, result, error) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_SQL_FINISH_EXECUTION = "UPDATE executions SET status = ?, finished_at = ?, result = ?, error = ? WHERE id = ?"
+# The [type] column aliases select the converters registered below; they key on
+# the query rather than the declared column type, so older schemas convert too.
+_SQL_GET_EXECUTION = (
+    'SELECT id, workflow_id, status, started_at AS "started_at [openflow_ms]", '
+    'finished_at AS "finished_at [openflow_ms]", result AS "result [openflow_json]", error '
+    "FROM executions WHERE id = ?"
+)
+_SQL_GET_EXECUTION_STATUS = "SELECT status FROM executions WHERE id = ?"
+
+# Validates a whole page of definitions in one parser pass.
+_WORKFLOW_LIST_ADAPTER = TypeAdapter(list[Workflow])
+
+
+def _to_ms(value: datetime | None) -> int | None:
+    if value is None:
+        return None
+    # Whole seconds and milliseconds separately, so float rounding in
+    # timestamp() cannot move the value across a millisecond boundary.
+    return int(value.replace(microsecond=0).timestamp()) * 1000 + value.microsecond // 1000
+
+
+def _truncate_ms(value: datetime) -> datetime:
+    """Drop sub-millisecond precision so returned records match what is stored."""
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def _convert_ms(value: bytes) -> datetime:
+    return datetime.fromtimestamp(int(value) / 1000, tz=timezone.utc)
+
+
+def _dump_result(result: dict | None) -> bytes | None:
+    if result is None:
+        return None
+    try:
+        # Node outputs may carry non-string keys, which json.dumps used to coerce.
+        return orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        # orjson rejects integers beyond 64 bits; stdlib json writes them exactly.
+        return json.dumps(result).encode()
+
+
+# orjson reads integers beyond 64 bits as floats without complaint, so any
+# long digit run sends the document through stdlib json instead.
+_LONG_DIGITS_RE = re.compile(rb"\d{19,}")
+
+
+def _load_result(value: bytes) -> dict:
+    if _LONG_DIGITS_RE.search(value):
+        return json.loads(value)
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        # Rows written by json.dumps may hold NaN/Infinity, which orjson refuses.
+        return json.loads(value)
+
+
+def _parse_iso(value: str | None) -> datetime | None:
+    if value is None:
+        return None
+    return datetime.fromisoformat(value)
+
+
+# Converters are registered process-wide and apply to any connection that
+# asks for these type names, hence the openflow_ prefix to keep them from
+# matching other code's declared column types or aliases. Values are bound
+# through explicit _to_ms/_dump_result calls rather than global adapters.
+sqlite3.register_converter("openflow_ms", _convert_ms)
+sqlite3.register_converter("openflow_json", _load_result)
+
+
+def _dump_workflow(workflow: Workflow) -> bytes:
+    # Same bytes as model_dump_json().encode(), without the str round-trip.
+    return pydantic_core.to_json(workflow)
+
+
+def _workflow_row(workflow: Workflow) -> tuple:
+    return (
+        workflow.id,
+        workflow.name,
+        _dump_workflow(workflow),
+        _to_ms(workflow.created_at),
+    )
+
+
+def _execution_row(execution: ExecutionRecord) -> tuple:
+    return (
+        execution.id,
+        execution.workflow_id,
+        execution.status,
+        _to_ms(execution.started_at),
+        _to_ms(execution.finished_at),
+        _dump_result(execution.result),
+        execution.error,
+    )
+
+
+# Applied to every connection; journal_mode is persisted in the database file.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+class SQLiteConnectionPool:
+    """One read-write connection for writers plus a pool of read-only connections."""
+
+    def __init__(self, db_path: Path, read_pool_size: int | None = None) -> None:
+        self.db_path = db_path
+        # WAL lets readers proceed while a write is in flight; writers share one
+        # connection and are serialized here rather than by SQLite returning
+        # "database is locked".
+        self._write_lock = threading.RLock()
+        # Nesting depth of writer() on the thread holding _write_lock.
+        self._write_depth = 0
+        self._write_conn = self._open(str(db_path))
+        # journal_mode cannot be changed inside a transaction.
+        self._write_conn.execute("PRAGMA journal_mode=WAL")
+
+        size = read_pool_size if read_pool_size is not None else max(4, os.cpu_count() or 1)
+        read_uri = f"{db_path.resolve().as_uri()}?mode=ro"
+        self._readers: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+        for _ in range(size):
+            self._readers.put(self._open(read_uri, uri=True))
+
+    @staticmethod
+    def _open(database: str, *, uri: bool = False) -> sqlite3.Connection:
+        # isolation_level=None: no implicit transactions, writes use explicit BEGIN/COMMIT.
+        conn = sqlite3.connect(
+            database,
+            uri=uri,
+            check_same_thread=False,
+            isolation_level=None,
+            detect_types=sqlite3.PARSE_COLNAMES,
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Run the block in a write transaction.
+
+        Nested calls on the same thread join the outer transaction through a
+        savepoint, so only the outermost block commits.
+        """
+        with self._write_lock:
+            conn = self._write_conn
+            nested = self._write_depth > 0
+            conn.execute("SAVEPOINT nested" if nested else "BEGIN IMMEDIATE")
+            self._write_depth += 1
+            try:
+                yield conn
+                conn.execute("RELEASE nested" if nested else "COMMIT")
+            except BaseException:
+                # Also covers a failed COMMIT, which would otherwise leave the
+                # shared connection stuck inside the transaction.
+                self._rollback(conn, nested)
+                raise
+            finally:
+                self._write_depth -= 1
+
+    @staticmethod
+    def _rollback(conn: sqlite3.Connection, nested: bool) -> None:
+        # SQLite may already have rolled back on its own (e.g. disk full); the
+        # original error matters more than one raised while cleaning up.
+        if not conn.in_transaction:
+            return
+        try:
+            if nested:
+                conn.execute("ROLLBACK TO nested")
+                conn.execute("RELEASE nested")
+            else:
+                conn.execute("ROLLBACK")
+        except sqlite3.Error:
+            pass
+
+
 class SQLiteStore:
-    def __init__(self, db_path: str = "data/workflows.db") -> None:
+    def __init__(self, db_path: str = "data/workflows.db", read_pool_size: int | None = None) -> None:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool = SQLiteConnectionPool(self.db_path, read_pool_size)
         self._init_db()
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
     def _init_db(self) -> None:
-        with self._connect() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS workflows (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    definition TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS executions (
-                    id TEXT PRIMARY KEY,
-                    workflow_id TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    started_at TEXT NOT NULL,
-                    finished_at TEXT,
-                    result TEXT,
-                    error TEXT,
-                    FOREIGN KEY(workflow_id) REFERENCES workflows(id)
+        with self._pool.writer() as conn:
+            conn.execute(_SQL_CREATE_WORKFLOWS)
+            conn.execute(_SQL_CREATE_EXECUTIONS)
+            self._migrate_legacy_schema(conn)
+            conn.execute(_SQL_CREATE_EXECUTIONS_WORKFLOW_INDEX)
+            conn.execute(_SQL_CREATE_WORKFLOWS_CREATED_INDEX)
+
+    @staticmethod
+    def _migrate_legacy_schema(conn: sqlite3.Connection) -> None:
+        """Rebuild tables created with ISO-text timestamps as unix-ms integers.
+
+        TEXT column affinity would turn bound integers back into strings, so
+        the tables are recreated rather than updated in place.
+        """
+        columns = {row["name"]: row["type"] for row in conn.execute("PRAGMA table_info(workflows)")}
+        if columns.get("created_at", "").upper() != "TEXT":
+            return
+
+        workflows = conn.execute("SELECT id, name, definition, created_at FROM workflows").fetchall()
+        executions = conn.execute(
+            "SELECT id, workflow_id, status, started_at, finished_at, result, error FROM executions"
+        ).fetchall()
+        conn.execute("DROP TABLE executions")
+        conn.execute("DROP TABLE workflows")
+        conn.execute(_SQL_CREATE_WORKFLOWS)
+        conn.execute(_SQL_CREATE_EXECUTIONS)
+        conn.executemany(
+            _SQL_INSERT_WORKFLOW,
+            [
+                (row["id"], row["name"], row["definition"], _to_ms(_parse_iso(row["created_at"])))
+                for row in workflows
+            ],
+        )
+        conn.executemany(
+            _SQL_INSERT_EXECUTION,
+            [
+                (
+                    row["id"],
+                    row["workflow_id"],
+                    row["status"],
+                    _to_ms(_parse_iso(row["started_at"])),
+                    _to_ms(_parse_iso(row["finished_at"])),
+                    row["result"],
+                    row["error"],
                 )
-                """
-            )
+                for row in executions
+            ],
+        )
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group several store writes into one commit.
+
+        Reads inside the block go through the read pool and do not see the
+        block's uncommitted writes.
+        """
+        with self._pool.writer():
+            yield
 
     def create_workflow(self, workflow: Workflow) -> Workflow:
-        with self._connect() as conn:
-            conn.execute(
-                "INSERT INTO workflows (id, name, definition, created_at) VALUES (?, ?, ?, ?)",
-                (
-                    workflow.id,
-                    workflow.name,
-                    workflow.model_dump_json(),
-                    workflow.created_at.isoformat(),
-                ),
-            )
+        with self._pool.writer() as conn:
+            conn.execute(_SQL_INSERT_WORKFLOW, _workflow_row(workflow))
         return workflow
 
+    def create_workflows(self, workflows: Iterable[Workflow]) -> None:
+        """Insert many workflows in a single transaction, e.g. when seeding."""
+        rows = [_workflow_row(workflow) for workflow in workflows]
+        with self._pool.writer() as conn:
+            conn.executemany(_SQL_INSERT_WORKFLOW, rows)
+
     def update_workflow(self, workflow_id: str, workflow: Workflow) -> Workflow | None:
-        with self._connect() as conn:
-            existing = conn.execute(
-                "SELECT id FROM workflows WHERE id = ?",
-                (workflow_id,),
-            ).fetchone()
-            if not existing:
-                return None
-            conn.execute(
-                "UPDATE workflows SET name = ?, definition = ? WHERE id = ?",
+        with self._pool.writer() as conn:
+            cursor = conn.execute(
+                _SQL_UPDATE_WORKFLOW,
                 (
                     workflow.name,
-                    workflow.model_dump_json(),
+                    _dump_workflow(workflow),
                     workflow_id,
                 ),
             )
+        # rowcount instead of RETURNING keeps this working on SQLite < 3.35.
+        if cursor.rowcount == 0:
+            return None
         return workflow
 
     def get_workflow(self, workflow_id: str) -> Workflow | None:
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT definition FROM workflows WHERE id = ?",
-                (workflow_id,),
-            ).fetchone()
+        with self._pool.reader() as conn:
+            row = conn.execute(_SQL_GET_WORKFLOW, (workflow_id,)).fetchone()
 
         if not row:
             return None
         return Workflow.model_validate_json(row["definition"])
 
     def list_workflows(self) -> list[Workflow]:
-        with self._connect() as conn:
-            rows = conn.execute("SELECT definition FROM workflows ORDER BY created_at DESC").fetchall()
+        with self._pool.reader() as conn:
+            rows = conn.execute(_SQL_LIST_WORKFLOWS).fetchall()
 
-        return [Workflow.model_validate_json(row["definition"]) for row in rows]
+        if not rows:
+            return []
+        # Databases created before the BLOB switch may still hand back str.
+        definitions = [
+            definition.encode() if isinstance(definition, str) else definition
+            for (definition,) in rows
+        ]
+        return _WORKFLOW_LIST_ADAPTER.validate_json(b"[" + b",".join(definitions) + b"]")
 
     def create_execution(self, workflow_id: str) -> ExecutionRecord:
         execution = ExecutionRecord(
-            id=str(uuid.uuid4()),
+            id=secrets.token_hex(16),
             workflow_id=workflow_id,
             status="running",
-            started_at=datetime.now(timezone.utc),
+            started_at=_truncate_ms(datetime.now(timezone.utc)),
         )
-        with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT INTO executions (id, workflow_id, status, started_at, finished_at, result, error)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    execution.id,
-                    execution.workflow_id,
-                    execution.status,
-                    execution.started_at.isoformat(),
-                    None,
-                    None,
-                    None,
-                ),
-            )
+        with self._pool.writer() as conn:
+            conn.execute(_SQL_INSERT_EXECUTION, _execution_row(execution))
+        return execution
+
+    def create_executions(self, records: Iterable[ExecutionRecord]) -> None:
+        """Insert many execution records in a single transaction, e.g. for backfills."""
+        rows = [_execution_row(record) for record in records]
+        with self._pool.writer() as conn:
+            conn.executemany(_SQL_INSERT_EXECUTION, rows)
+
+    def record_execution(
+        self,
+        workflow_id: str,
+        status: str,
+        started_at: datetime,
+        result: dict | None = None,
+        error: str | None = None,
+        finished_at: datetime | None = None,
+    ) -> ExecutionRecord:
+        """Insert an already-finished run in one statement.
+
+        Synchronous runs use this instead of create_execution followed by
+        finish_execution, which stay for runs that outlive the request.
+        """
+        execution = ExecutionRecord(
+            id=secrets.token_hex(16),
+            workflow_id=workflow_id,
+            status=status,
+            started_at=_truncate_ms(started_at),
+            finished_at=_truncate_ms(finished_at or datetime.now(timezone.utc)),
+            result=result,
+            error=error,
+        )
+        with self._pool.writer() as conn:
+            conn.execute(_SQL_INSERT_EXECUTION, _execution_row(execution))
         return execution
 
     def finish_execution(
@@ -127,25 +410,24 @@ class SQLiteStore:
         result: dict | None = None,
         error: str | None = None,
     ) -> None:
-        finished_at = datetime.now(timezone.utc).isoformat()
-        result_blob = json.dumps(result) if result is not None else None
+        finished_at = _to_ms(datetime.now(timezone.utc))
+        result_blob = _dump_result(result)
 
-        with self._connect() as conn:
+        with self._pool.writer() as conn:
             conn.execute(
-                """
-                UPDATE executions
-                SET status = ?, finished_at = ?, result = ?, error = ?
-                WHERE id = ?
-                """,
+                _SQL_FINISH_EXECUTION,
                 (status, finished_at, result_blob, error, execution_id),
             )
 
+    def get_execution_status(self, execution_id: str) -> str | None:
+        """Return just the status, leaving the result BLOB unread, for pollers."""
+        with self._pool.reader() as conn:
+            row = conn.execute(_SQL_GET_EXECUTION_STATUS, (execution_id,)).fetchone()
+        return row["status"] if row else None
+
     def get_execution(self, execution_id: str) -> ExecutionRecord | None:
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT * FROM executions WHERE id = ?",
-                (execution_id,),
-            ).fetchone()
+        with self._pool.reader() as conn:
+            row = conn.execute(_SQL_GET_EXECUTION, (execution_id,)).fetchone()
 
         if not row:
             return None
@@ -154,8 +436,8 @@ class SQLiteStore:
             id=row["id"],
             workflow_id=row["workflow_id"],
             status=row["status"],
-            started_at=datetime.fromisoformat(row["started_at"]),
-            finished_at=datetime.fromisoformat(row["finished_at"]) if row["finished_at"] else None,
-            result=json.loads(row["result"]) if row["result"] else None,
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+            result=row["result"],
             error=row["error"],
         )
@@ -1,54 +1,236 @@
 from __future__ import annotations
 
-import json
+import ast
 import math
+import operator
+import re
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Callable
-from urllib.parse import urlparse
-from urllib.request import Request, urlopen
+from urllib.parse import urljoin, urlparse
+from urllib.request import getproxies, proxy_bypass
 
+import orjson
+import urllib3
 from langchain_core.tools import StructuredTool
 
 from .config import app_config
 
 
+_CALCULATOR_NAMES = {
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    "sqrt": math.sqrt,
+}
+_CALCULATOR_EXPR_RE = re.compile(r"[0-9A-Za-z_+\-*/()., %]+")
+_CALCULATOR_MAX_POW_BITS = 100_000
+
+
+def _bounded_pow(base: Any, exponent: Any) -> Any:
+    # Positive integer powers are exact and can grow without limit, pinning a
+    # worker thread; float and negative powers overflow or underflow on their own.
+    if (
+        isinstance(base, int)
+        and isinstance(exponent, int)
+        and exponent > 0
+        and abs(base) > 1
+        and exponent * abs(base).bit_length() > _CALCULATOR_MAX_POW_BITS
+    ):
+        raise ValueError("result too large")
+    return operator.pow(base, exponent)
+
+
+_CALCULATOR_BINOPS: dict[type[ast.operator], Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _bounded_pow,
+}
+_CALCULATOR_UNARYOPS: dict[type[ast.unaryop], Callable[[Any], Any]] = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+# Decimal literals that stand alone as tokens; anything glued to identifier
+# characters (hex, complex, names with digits) is left in the template as-is.
+_CALCULATOR_NUMBER_RE = re.compile(
+    r"(?<![\w.])(?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eE][+-]?\d[\d_]*)?(?![\w.])"
+)
+
+_Compiled = Callable[[tuple], Any]
+
+
+def _parse_number(text: str) -> int | float:
+    if "." in text or "e" in text or "E" in text:
+        return float(text)
+    return int(text)
+
+
+def _split_constants(expression: str) -> tuple[str, tuple]:
+    """Replace numeric literals with a 0 placeholder and return them in order.
+
+    Expressions that differ only in their numbers share a template, so they
+    share one compiled evaluator.
+    """
+    constants: list[int | float] = []
+
+    def _slot(match: re.Match[str]) -> str:
+        constants.append(_parse_number(match.group()))
+        return "0"
+
+    return _CALCULATOR_NUMBER_RE.sub(_slot, expression), tuple(constants)
+
+
+@lru_cache(maxsize=512)
+def _compile_template(template: str) -> _Compiled:
+    # Placeholders keep their column in the template, which maps each parsed
+    # constant back to its slot in the constants tuple.
+    slots = {match.start(): index for index, match in enumerate(_CALCULATOR_NUMBER_RE.finditer(template))}
+    return _compile_node(ast.parse(template, mode="eval").body, slots)
+
+
+def _compile_node(node: ast.expr, slots: dict[int, int]) -> _Compiled:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        index = slots.get(node.col_offset)
+        if index is not None:
+            return lambda constants: constants[index]
+        value = node.value
+        return lambda constants: value
+    if isinstance(node, ast.BinOp) and type(node.op) in _CALCULATOR_BINOPS:
+        op = _CALCULATOR_BINOPS[type(node.op)]
+        left = _compile_node(node.left, slots)
+        right = _compile_node(node.right, slots)
+        return lambda constants: op(left(constants), right(constants))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _CALCULATOR_UNARYOPS:
+        op = _CALCULATOR_UNARYOPS[type(node.op)]
+        operand = _compile_node(node.operand, slots)
+        return lambda constants: op(operand(constants))
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+        func = _CALCULATOR_NAMES.get(node.func.id)
+        if func is None:
+            raise NameError(f"name '{node.func.id}' is not defined")
+        args = tuple(_compile_node(arg, slots) for arg in node.args)
+        return lambda constants: func(*[arg(constants) for arg in args])
+    if isinstance(node, ast.Name):
+        if node.id not in _CALCULATOR_NAMES:
+            raise NameError(f"name '{node.id}' is not defined")
+        value = _CALCULATOR_NAMES[node.id]
+        return lambda constants: value
+    if isinstance(node, ast.Tuple):
+        elts = tuple(_compile_node(elt, slots) for elt in node.elts)
+        return lambda constants: tuple(elt(constants) for elt in elts)
+    raise ValueError(f"unsupported expression: {type(node).__name__}")
+
+
 def _calculator(expression: str) -> str:
-    allowed_names = {
-        "abs": abs,
-        "round": round,
-        "min": min,
-        "max": max,
-        "sqrt": math.sqrt,
-    }
-    allowed_chars = set("0123456789+-*/()., %abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_")
-    if not expression or any(ch not in allowed_chars for ch in expression):
+    # eval() ignored leading spaces; ast.parse reports them as an indent.
+    expression = expression.strip(" ")
+    if not expression or not _CALCULATOR_EXPR_RE.fullmatch(expression):
         return "Invalid expression"
     try:
-        result = eval(expression, {"__builtins__": {}}, allowed_names)  # noqa: S307
+        template, constants = _split_constants(expression)
+        return str(_compile_template(template)(constants))
     except Exception as exc:
         return f"Calculation error: {exc}"
-    return str(result)
 
 
 def _utc_time() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+_HTTP_SCHEMES = frozenset({"http", "https"})
+
+# Shared across tool builds so repeated fetches reuse keep-alive and TLS sessions.
+# Like urlopen, a failed connection is not retried; redirects are followed by
+# _http_get itself so every hop passes the allowlist.
+_HTTP_POOL_KW: dict[str, Any] = {
+    "num_pools": 4,
+    "maxsize": 16,
+    "timeout": 8.0,
+    "retries": urllib3.Retry(total=0, redirect=False),
+    "headers": {"User-Agent": "OpenFlow-Agent/0.1"},
+}
+_HTTP = urllib3.PoolManager(**_HTTP_POOL_KW)
+# HTTP(S)_PROXY / NO_PROXY, honoured the same way urlopen's ProxyHandler did.
+_HTTP_PROXIES = {scheme: url for scheme, url in getproxies().items() if scheme in _HTTP_SCHEMES}
+# Same hop limit as urllib's HTTPRedirectHandler.
+_HTTP_MAX_REDIRECTS = 10
+
+_HTTP_READ_LIMIT = 4000
+
+
+def _http_read_limit(resp: urllib3.BaseHTTPResponse) -> int:
+    # Content-Length counts encoded bytes, so only trust it for identity bodies.
+    length = resp.headers.get("Content-Length")
+    if length and length.isdigit() and not resp.headers.get("Content-Encoding"):
+        return min(_HTTP_READ_LIMIT, int(length))
+    return _HTTP_READ_LIMIT
+
+
+@lru_cache(maxsize=None)
+def _proxy_manager(proxy_url: str) -> urllib3.ProxyManager:
+    return urllib3.ProxyManager(proxy_url, **_HTTP_POOL_KW)
+
+
+def _http_pool(url: str) -> urllib3.PoolManager:
+    parsed = urlparse(url)
+    proxy_url = _HTTP_PROXIES.get(parsed.scheme)
+    if proxy_url and not proxy_bypass(parsed.hostname or ""):
+        return _proxy_manager(proxy_url)
+    return _HTTP
+
+
+def _finish_response(resp: urllib3.BaseHTTPResponse) -> None:
+    # A connection with unread body bytes would hand them to the next request
+    # as its status line, so only fully consumed connections are reused.
+    if resp.length_remaining != 0:
+        resp.close()
+    resp.release_conn()
+
+
 def _build_http_get_tool(allow_domains: list[str]) -> Callable[[str], str]:
-    allow = {domain.strip().lower() for domain in allow_domains if domain.strip()}
+    allow = frozenset(domain.strip().lower() for domain in allow_domains if domain.strip())
+    blocked_message = f"Domain blocked. Allowed domains: {sorted(allow)}"
 
-    def _http_get(url: str) -> str:
+    def _rejection(url: str) -> str | None:
         parsed = urlparse(url)
+        if parsed.scheme not in _HTTP_SCHEMES:
+            return "Invalid URL"
         host = (parsed.hostname or "").lower()
         if not host:
             return "Invalid URL"
         if allow and host not in allow:
-            return f"Domain blocked. Allowed domains: {sorted(allow)}"
+            return blocked_message
+        return None
+
+    def _http_get(url: str) -> str:
+        rejection = _rejection(url)
+        if rejection is not None:
+            return rejection
         try:
-            req = Request(url, headers={"User-Agent": "OpenFlow-Agent/0.1"})
-            with urlopen(req, timeout=8) as resp:  # noqa: S310
-                body = resp.read(4000).decode("utf-8", errors="ignore")
-            return body
+            for _ in range(_HTTP_MAX_REDIRECTS + 1):
+                resp = _http_pool(url).request("GET", url, preload_content=False, redirect=False)
+                try:
+                    location = resp.get_redirect_location()
+                    if location:
+                        resp.drain_conn()
+                        url = urljoin(url, location)
+                        rejection = _rejection(url)
+                        if rejection is not None:
+                            return rejection
+                        continue
+                    if resp.status >= 400:
+                        return f"HTTP error: HTTP Error {resp.status}: {resp.reason}"
+                    return resp.read(_http_read_limit(resp)).decode("utf-8", errors="ignore")
+                finally:
+                    _finish_response(resp)
+            return "HTTP error: too many redirects"
         except Exception as exc:
             return f"HTTP error: {exc}"
 
@@ -56,17 +238,25 @@ def _build_http_get_tool(allow_domains: list[str]) -> Callable[[str], str]:
 
 
 def _build_tavily_search_tool(max_results: int) -> Callable[[str], str]:
+    try:
+        from tavily import TavilyClient
+    except ImportError:
+        TavilyClient = None
+
+    # Created on first use so a missing TAVILY_API_KEY only surfaces when searching.
+    client = None
+
     def _tavily_search(query: str) -> str:
-        try:
-            from tavily import TavilyClient
-        except ImportError as exc:
+        nonlocal client
+        if TavilyClient is None:
             return (
                 "Missing Tavily dependency. Install with: "
                 "pip install tavily-python and set TAVILY_API_KEY."
             )
 
         try:
-            client = TavilyClient()
+            if client is None:
+                client = TavilyClient()
             response = client.search(query=query, max_results=max_results)
             results = response.get("results", [])
             compact = [
@@ -77,7 +267,7 @@ def _build_tavily_search_tool(max_results: int) -> Callable[[str], str]:
                 }
                 for item in results
             ]
-            return json.dumps(compact, ensure_ascii=True)
+            return orjson.dumps(compact).decode()
         except Exception as exc:
             return f"Tavily error: {exc}"
 
@@ -99,37 +289,60 @@ def tool_catalog() -> list[dict[str, str]]:
     ]
 
 
-def build_agent_tools(selected: list[str]) -> list[StructuredTool]:
-    settings = app_config.agent_tool_settings()
-    allow_http_domains = settings["allow_http_domains"]
-    tavily_max_results = int(settings["tavily_max_results"])
-
-    registry: dict[str, StructuredTool] = {
-        "calculator": StructuredTool.from_function(
-            func=_calculator,
-            name="calculator",
-            description="Evaluate a math expression, e.g. '(42*7)/3'.",
-        ),
-        "utc_time": StructuredTool.from_function(
-            func=_utc_time,
-            name="utc_time",
-            description="Return the current UTC timestamp.",
-        ),
-        "http_get": StructuredTool.from_function(
-            func=_build_http_get_tool(allow_http_domains if isinstance(allow_http_domains, list) else []),
-            name="http_get",
-            description="Fetch page text from a URL. Respects allowlist.",
-        ),
-        "tavily_search": StructuredTool.from_function(
-            func=_build_tavily_search_tool(tavily_max_results),
-            name="tavily_search",
-            description="Search the web with Tavily and return compact JSON results.",
+# Each tool is built on first selection and then shared; the settings they read
+# are fixed for the lifetime of the process.
+@lru_cache(maxsize=None)
+def _calculator_tool() -> StructuredTool:
+    return StructuredTool.from_function(
+        func=_calculator,
+        name="calculator",
+        description="Evaluate a math expression, e.g. '(42*7)/3'.",
+    )
+
+
+@lru_cache(maxsize=None)
+def _utc_time_tool() -> StructuredTool:
+    return StructuredTool.from_function(
+        func=_utc_time,
+        name="utc_time",
+        description="Return the current UTC timestamp.",
+    )
+
+
+@lru_cache(maxsize=None)
+def _http_get_tool() -> StructuredTool:
+    allow_http_domains = app_config.agent_tool_settings()["allow_http_domains"]
+    return StructuredTool.from_function(
+        func=_build_http_get_tool(
+            list(allow_http_domains) if isinstance(allow_http_domains, (list, tuple)) else []
         ),
-    }
+        name="http_get",
+        description="Fetch page text from a URL. Respects allowlist.",
+    )
 
+
+@lru_cache(maxsize=None)
+def _tavily_search_tool() -> StructuredTool:
+    tavily_max_results = int(app_config.agent_tool_settings()["tavily_max_results"])
+    return StructuredTool.from_function(
+        func=_build_tavily_search_tool(tavily_max_results),
+        name="tavily_search",
+        description="Search the web with Tavily and return compact JSON results.",
+    )
+
+
+_TOOL_BUILDERS: dict[str, Callable[[], StructuredTool]] = {
+    "calculator": _calculator_tool,
+    "utc_time": _utc_time_tool,
+    "http_get": _http_get_tool,
+    "tavily_search": _tavily_search_tool,
+}
+
+
+def build_agent_tools(selected: list[str]) -> list[StructuredTool]:
     resolved: list[StructuredTool] = []
     for tool_name in selected:
-        tool = registry.get(tool_name)
-        if tool is not None:
-            resolved.append(tool)
+        builder = _TOOL_BUILDERS.get(tool_name)
+        if builder is not None:
+            resolved.append(builder())
     return resolved
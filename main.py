@@ -1,5 +1,20 @@
+import sys
+
 from bot.api import app
 
 
 # ASGI app entrypoint for `uvicorn main:app --reload`
 __all__ = ["app"]
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop has no Windows build; fall back to the stdlib asyncio loop there.
+    uvicorn.run(
+        "main:app",
+        host="127.0.0.1",
+        port=8000,
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+    )
@@ -0,0 +1,25 @@
+from bot.tooling import _calculator
+
+
+def test_leading_spaces_are_ignored() -> None:
+    assert _calculator(" 2+2") == "4"
+    assert _calculator("  (42*7)/3 ") == "98.0"
+
+
+def test_blank_expression_is_invalid() -> None:
+    assert _calculator("   ") == "Invalid expression"
+
+
+def test_huge_integer_powers_are_rejected() -> None:
+    assert _calculator("(9**9999)**9999") == "Calculation error: result too large"
+    assert _calculator("10**10**10") == "Calculation error: result too large"
+
+
+def test_unprintable_results_are_reported() -> None:
+    assert _calculator("9**9999").startswith("Calculation error:")
+
+
+def test_trivial_powers_still_evaluate() -> None:
+    assert _calculator("1**100000000") == "1"
+    assert _calculator("2**-3") == "0.125"
+    assert _calculator("(-2)**3") == "-8"
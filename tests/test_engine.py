@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from bot.engine import WorkflowEngine
+from bot.models import Workflow
+from bot.nodes import register_builtin_nodes
+from bot.nodes.base import NodeRegistry, NodeSpec
+
+
+def _tag(params, payload):
+    return {**payload, params["key"]: params.get("value", True)}
+
+
+@pytest.fixture()
+def registry() -> NodeRegistry:
+    registry = NodeRegistry()
+    register_builtin_nodes(registry)
+    registry.register(NodeSpec("tag", "", _tag))
+    return registry
+
+
+def _workflow(nodes, edges=None) -> Workflow:
+    return Workflow(id="wf", name="wf", nodes=nodes, edges=edges or {})
+
+
+def test_chain_takes_linear_path_and_threads_payload(registry, monkeypatch) -> None:
+    engine = WorkflowEngine(registry)
+    monkeypatch.setattr(engine, "_topological_sort", pytest.fail)
+    workflow = _workflow(
+        [
+            {"id": "a", "type": "tag", "params": {"key": "a"}},
+            {"id": "b", "type": "tag", "params": {"key": "b"}},
+            {"id": "c", "type": "tag", "params": {"key": "c"}},
+        ],
+        {"a": ["b"], "b": ["c"]},
+    )
+    assert engine.run(workflow, {"in": 1}) == {"in": 1, "a": True, "b": True, "c": True}
+
+
+def test_unconnected_nodes_each_receive_input(registry) -> None:
+    workflow = _workflow(
+        [
+            {"id": "a", "type": "tag", "params": {"key": "a"}},
+            {"id": "b", "type": "tag", "params": {"key": "b"}},
+        ]
+    )
+    assert WorkflowEngine(registry).run(workflow, {"in": 1}) == {"in": 1, "b": True}
+
+
+def test_empty_workflow_returns_input(registry) -> None:
+    assert WorkflowEngine(registry).run(_workflow([]), {"in": 1}) == {"in": 1}
+
+
+def test_empty_parent_payload_falls_back_to_input(registry) -> None:
+    workflow = _workflow(
+        [
+            {"id": "t", "type": "manual_trigger"},
+            {"id": "s", "type": "set_fields", "params": {"fields": {}}},
+        ],
+        {"t": ["s"]},
+    )
+    assert WorkflowEngine(registry).run(workflow, {}) == {}
+    assert WorkflowEngine(registry).run(workflow, {"in": 1}) == {"in": 1}
+
+
+def test_siblings_run_concurrently_and_merge_in_edge_order(registry) -> None:
+    barrier = threading.Barrier(3, timeout=5)
+
+    def wait_for_siblings(params, payload):
+        # Deadlocks (and times out) unless all three siblings run at once.
+        barrier.wait()
+        return {**payload, "last": params["key"], params["key"]: True}
+
+    registry.register(NodeSpec("sibling", "", wait_for_siblings))
+    workflow = _workflow(
+        [
+            {"id": "t", "type": "manual_trigger"},
+            {"id": "a", "type": "sibling", "params": {"key": "a"}},
+            {"id": "b", "type": "sibling", "params": {"key": "b"}},
+            {"id": "c", "type": "sibling", "params": {"key": "c"}},
+            {"id": "join", "type": "tag", "params": {"key": "join"}},
+        ],
+        {"t": ["a", "b", "c"], "a": ["join"], "b": ["join"], "c": ["join"]},
+    )
+    result = WorkflowEngine(registry).run(workflow, {"in": 1})
+    assert result == {"in": 1, "a": True, "b": True, "c": True, "last": "c", "join": True}
+
+
+def test_handler_error_propagates(registry) -> None:
+    def boom(_params, _payload):
+        raise RuntimeError("boom")
+
+    registry.register(NodeSpec("boom", "", boom))
+    workflow = _workflow(
+        [
+            {"id": "t", "type": "manual_trigger"},
+            {"id": "a", "type": "boom"},
+            {"id": "b", "type": "tag", "params": {"key": "b"}},
+        ],
+        {"t": ["a", "b"]},
+    )
+    with pytest.raises(RuntimeError, match="boom"):
+        WorkflowEngine(registry).run(workflow, {})
+
+
+@pytest.mark.parametrize(
+    ("nodes", "edges", "message"),
+    [
+        (["a", "b"], {"a": ["b"], "b": ["a"]}, "cycle"),
+        (["a", "a", "b"], {"a": ["b"]}, "duplicate node ids"),
+        (["a", "b"], {"a": ["missing"]}, "Unknown target"),
+    ],
+)
+def test_invalid_graphs_are_rejected(registry, nodes, edges, message) -> None:
+    workflow = _workflow([{"id": node_id, "type": "manual_trigger"} for node_id in nodes], edges)
+    with pytest.raises(ValueError, match=message):
+        WorkflowEngine(registry).run(workflow, {})
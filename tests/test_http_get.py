@@ -0,0 +1,100 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from bot import tooling
+
+
+class _KeepAliveServer:
+    """Minimal HTTP/1.1 server that keeps connections open and counts them."""
+
+    def __init__(self, routes) -> None:
+        self.routes = routes
+        self.connections = 0
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self._listener.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket) -> None:
+        with conn, conn.makefile("rb") as reader:
+            while True:
+                request_line = reader.readline()
+                if not request_line:
+                    return
+                while reader.readline() not in (b"\r\n", b""):
+                    pass
+                for chunk in self.routes[request_line.split()[1].decode()]:
+                    conn.sendall(chunk)
+                    time.sleep(0.02)
+
+    def close(self) -> None:
+        self._listener.close()
+
+
+def _ok(body: bytes) -> list[bytes]:
+    return [b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body) + body]
+
+
+@pytest.fixture()
+def server(monkeypatch):
+    monkeypatch.setattr(tooling, "_HTTP_PROXIES", {})
+    big_header = b"HTTP/1.1 200 OK\r\nContent-Length: 10000\r\n\r\n"
+    redirect_body = b"R" * 3000
+    server = _KeepAliveServer(
+        {
+            "/small": _ok(b"hello"),
+            # Sent in two parts so the unread tail is still in flight after the read.
+            "/big": [big_header + b"A" * 4000, b"B" * 6000],
+            "/redirect": [
+                b"HTTP/1.1 302 Found\r\nLocation: /small\r\nContent-Length: 3000\r\n\r\n" + redirect_body
+            ],
+            "/escape": [
+                b"HTTP/1.1 302 Found\r\nLocation: http://blocked.invalid/\r\nContent-Length: 0\r\n\r\n"
+            ],
+        }
+    )
+    yield server
+    server.close()
+
+
+def test_fully_read_responses_reuse_one_connection(server) -> None:
+    http_get = tooling._build_http_get_tool([])
+    assert [http_get(server.url("/small")) for _ in range(3)] == ["hello"] * 3
+    assert server.connections == 1
+
+
+def test_partially_read_connection_is_not_reused(server) -> None:
+    http_get = tooling._build_http_get_tool([])
+    assert http_get(server.url("/big")) == "A" * 4000
+    assert http_get(server.url("/small")) == "hello"
+    assert server.connections == 2
+
+
+def test_redirect_body_is_drained_before_following(server) -> None:
+    http_get = tooling._build_http_get_tool([])
+    assert http_get(server.url("/redirect")) == "hello"
+    assert http_get(server.url("/small")) == "hello"
+    assert server.connections == 1
+
+
+def test_redirects_are_checked_against_the_allowlist(server) -> None:
+    http_get = tooling._build_http_get_tool(["127.0.0.1"])
+    assert http_get(server.url("/escape")) == "Domain blocked. Allowed domains: ['127.0.0.1']"
+
+
+def test_non_http_schemes_are_rejected() -> None:
+    assert tooling._build_http_get_tool([])("file:///etc/passwd") == "Invalid URL"
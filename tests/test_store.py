@@ -0,0 +1,103 @@
+import sqlite3
+from datetime import datetime, timezone
+
+from bot.models import Workflow
+from bot.store import SQLiteStore
+
+_LEGACY_SCHEMA = (
+    """
+    CREATE TABLE workflows (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        definition TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE executions (
+        id TEXT PRIMARY KEY,
+        workflow_id TEXT NOT NULL,
+        status TEXT NOT NULL,
+        started_at TEXT NOT NULL,
+        finished_at TEXT,
+        result TEXT,
+        error TEXT,
+        FOREIGN KEY(workflow_id) REFERENCES workflows(id)
+    )
+    """,
+)
+
+
+def _legacy_database(path) -> None:
+    conn = sqlite3.connect(path)
+    for statement in _LEGACY_SCHEMA:
+        conn.execute(statement)
+    created = (("old", "2024-01-01T00:00:00+00:00"), ("new", "2024-06-01T00:00:00+00:00"))
+    for workflow_id, created_at in created:
+        workflow = Workflow(id=workflow_id, name=workflow_id, nodes=[], created_at=created_at)
+        conn.execute(
+            "INSERT INTO workflows VALUES (?, ?, ?, ?)",
+            (workflow.id, workflow.name, workflow.model_dump_json(), created_at),
+        )
+    conn.executemany(
+        "INSERT INTO executions VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                "done",
+                "old",
+                "success",
+                "2024-01-01T00:00:00.123456+00:00",
+                "2024-01-01T00:00:01+00:00",
+                '{"a": 1}',
+                None,
+            ),
+            ("running", "old", "running", "2024-01-01T00:00:00+00:00", None, None, None),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_legacy_text_timestamps_are_rebuilt_as_integers(tmp_path) -> None:
+    path = tmp_path / "legacy.db"
+    _legacy_database(path)
+
+    store = SQLiteStore(path)
+
+    done = store.get_execution("done")
+    assert done.started_at == datetime(2024, 1, 1, 0, 0, 0, 123000, tzinfo=timezone.utc)
+    assert done.finished_at == datetime(2024, 1, 1, 0, 0, 1, tzinfo=timezone.utc)
+    assert done.result == {"a": 1}
+    running = store.get_execution("running")
+    assert running.finished_at is None and running.result is None
+    assert [workflow.id for workflow in store.list_workflows()] == ["new", "old"]
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT DISTINCT typeof(created_at) FROM workflows").fetchall() == [("integer",)]
+    assert conn.execute(
+        "SELECT typeof(started_at), typeof(finished_at) FROM executions WHERE id = 'done'"
+    ).fetchone() == ("integer", "integer")
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_exec_workflow", "idx_wf_created"} <= indexes
+    conn.close()
+
+
+def test_reopening_a_migrated_database_keeps_its_data(tmp_path) -> None:
+    path = tmp_path / "legacy.db"
+    _legacy_database(path)
+    SQLiteStore(path)
+
+    store = SQLiteStore(path)
+    assert store.get_execution_status("done") == "success"
+    assert len(store.list_workflows()) == 2
+
+
+def test_recorded_execution_matches_what_is_read_back(tmp_path) -> None:
+    store = SQLiteStore(tmp_path / "store.db")
+    store.create_workflow(Workflow(id="wf", name="wf", nodes=[]))
+    result = {"big": 2**70, "text": "é"}
+
+    recorded = store.record_execution("wf", "success", datetime.now(timezone.utc), result=result)
+
+    assert store.get_execution(recorded.id) == recorded
+    assert store.get_execution(recorded.id).result == result